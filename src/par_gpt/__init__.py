@@ -2,17 +2,7 @@
 
 from __future__ import annotations
 
-import os
-import warnings
-
-import clipman
-from langchain._api import LangChainDeprecationWarning
-from langchain_core._api import LangChainBetaWarning
-
-warnings.simplefilter("ignore", category=LangChainDeprecationWarning)
-warnings.simplefilter("ignore", category=LangChainBetaWarning)
-
-clipman.init()
+from typing import TYPE_CHECKING, Any
 
 __author__ = "Paul Robello"
 __credits__ = ["Paul Robello"]
@@ -25,10 +15,6 @@ __env_var_prefix__ = "PARGPT"
 
 __licence__ = "MIT"
 
-
-os.environ["USER_AGENT"] = f"{__application_title__} {__version__}"
-
-
 __all__: list[str] = [
     "__author__",
     "__credits__",
@@ -39,4 +25,18 @@ __all__: list[str] = [
     "__licence__",
     "__application_title__",
     "__env_var_prefix__",
+    "ensure_initialized",
 ]
+
+
+if TYPE_CHECKING:
+    from ._init import ensure_initialized
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily loaded public names."""
+    if name == "ensure_initialized":
+        from ._init import ensure_initialized
+
+        return ensure_initialized
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
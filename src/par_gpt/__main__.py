@@ -1,20 +1,24 @@
 """Main application"""
 
+# E402 is exempted module wide for the import block after ensure_initialized(): par_ai_core and the package
+# modules import langchain, which needs USER_AGENT and the warning filters set first, and the third party
+# and package imports are kept together in one sorted block after the call.
+# ruff: noqa: E402
 from __future__ import annotations
 
-import importlib
+import codecs
+import functools
 import os
 import re
 import sys
-from io import StringIO
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, NamedTuple
+
+from . import ensure_initialized
+
+ensure_initialized()
 
-import clipman as clipboard
 import typer
-from dotenv import load_dotenv
-from langchain_community.tools import TavilySearchResults
-from langchain_core.tools import BaseTool
 from par_ai_core.llm_config import LlmConfig, LlmMode
 from par_ai_core.llm_image_utils import (
     UnsupportedImageTypeError,
@@ -33,46 +37,216 @@ from par_ai_core.par_logging import console_err
 from par_ai_core.pricing_lookup import PricingDisplay, show_llm_cost
 from par_ai_core.provider_cb_info import get_parai_callback
 from par_ai_core.utils import has_stdin_content
-from par_ai_core.web_tools import fetch_url_and_convert_to_markdown, web_search
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.pretty import Pretty
+from rich.table import Table
 from rich.text import Text
 
-from par_gpt.ai_tools.ai_tools import (
-    ai_brave_search,
-    ai_figlet,
-    ai_github_create_repo,
-    ai_github_list_repos,
-    ai_github_publish_repo,
-    ai_serper_search,
-)
-
 from . import __application_binary__, __application_title__, __env_var_prefix__, __version__
-from .agents import do_code_review_agent, do_prompt_generation_agent, do_single_llm_call, do_tool_agent
-from .ai_tools.ai_tools import (
-    ai_copy_from_clipboard,
-    ai_copy_to_clipboard,
-    ai_display_image_in_terminal,
-    ai_fetch_url,
-    ai_get_weather_current,
-    ai_get_weather_forecast,
-    ai_open_url,
-    ai_reddit_search,
-    ai_youtube_get_transcript,
-    ai_youtube_search,
-    git_commit_tool,
+from .agents import (
+    do_code_review_agent,
+    do_prompt_generation_agent,
+    do_single_llm_call,
+    supports_system_prompt,
 )
-from .ai_tools.par_python_repl import ParPythonAstREPLTool
-from .repo.repo import GitRepo
-from .utils import download_cache, mk_env_context, show_image_in_terminal
+from .utils import download_cache, enable_llm_cache, get_clipboard, mk_env_context, show_image_in_terminal
+
+if TYPE_CHECKING:
+    from langchain_core.tools import BaseTool
 
 app = typer.Typer()
 console = console_err
 
+# providers that do not need an API key
+_NO_API_KEY_PROVIDERS = frozenset({LlmProvider.OLLAMA, LlmProvider.LLAMACPP, LlmProvider.BEDROCK})
+_ENV_CONTEXT_RE = re.compile(r"(get|show|list|display) (env|environment|extra context)", re.IGNORECASE)
+_COMMIT_RE = re.compile(r"(git|gen|generate|create|do|show|display) commit", re.IGNORECASE)
+_SHOW_COMMIT_RE = re.compile(r"(display|show)\s?(git|gen|generate|create|do)? commit", re.IGNORECASE)
+
+
+REPL_MODULE_NAMES = [
+    "os",
+    "sys",
+    "re",
+    "json",
+    "time",
+    "datetime",
+    "random",
+    "string",
+    "pathlib",
+    "requests",
+    "git",
+    "pandas",
+    "faker",
+    "numpy",
+    "matplotlib",
+    "bs4",
+    "html2text",
+    "pydantic",
+    "clipman",
+    "pyfiglet",
+    "rich",
+    # "rich.console",
+    "rich.panel",
+    "rich.markdown",
+    "rich.pretty",
+    "rich.table",
+    "rich.text",
+    "rich.color",
+]
+
+
+class ToolSpec(NamedTuple):
+    """Tools from the ai_tools module that are only offered when their keywords and env vars are present."""
+
+    tool_names: tuple[str, ...]
+    keywords: frozenset[str] = frozenset()
+    """Question must mention one of these, empty means the tools are always offered."""
+    env_vars: tuple[str, ...] = ()
+    """All of these must be set."""
+
+    def matches(self, found_keywords: set[str]) -> bool:
+        """Return True if the tools should be offered for the keywords found in the question."""
+        if self.keywords and self.keywords.isdisjoint(found_keywords):
+            return False
+        return all(os.environ.get(env_var) for env_var in self.env_vars)
+
+
+_TOOL_REGISTRY: tuple[ToolSpec, ...] = (
+    ToolSpec(("ai_figlet",), frozenset({"figlet"})),
+    ToolSpec(("ai_youtube_search",), frozenset({"youtube"}), ("GOOGLE_API_KEY",)),
+    ToolSpec(("ai_copy_to_clipboard", "ai_copy_from_clipboard"), frozenset({"clipboard"})),
+    ToolSpec(("ai_get_weather_current", "ai_get_weather_forecast"), frozenset({"weather", "wx"}), ("WEATHERAPI_KEY",)),
+    ToolSpec(
+        ("ai_github_list_repos", "ai_github_create_repo", "ai_github_publish_repo"),
+        frozenset({"github"}),
+        ("GITHUB_PERSONAL_ACCESS_TOKEN",),
+    ),
+    ToolSpec(("ai_brave_search",), env_vars=("BRAVE_API_KEY",)),
+    ToolSpec(("ai_reddit_search",), env_vars=("REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET")),
+)
+# single pass over the question for every registry keyword, short keywords must be whole words
+_KEYWORD_RE = re.compile(
+    "|".join(
+        rf"\b{re.escape(keyword)}\b" if len(keyword) < 3 else re.escape(keyword)
+        for keyword in sorted(set().union(*(spec.keywords for spec in _TOOL_REGISTRY)))
+    ),
+    re.IGNORECASE,
+)
 
-load_dotenv()
-load_dotenv(Path(f"~/.{__application_binary__}.env").expanduser())
+
+def build_ai_tool_list(question: str, *, repl: bool, yes_to_all: bool) -> list[BaseTool]:
+    """Build the list of tools available to the agent, keyword gated tools are matched against question."""
+    from langchain_community.tools import TavilySearchResults
+    from par_ai_core.web_tools import web_search
+
+    from .ai_tools import ai_tools as tools_module
+    from .ai_tools.par_python_repl import LazyModuleDict, ParPythonAstREPLTool
+
+    ai_tools: list[BaseTool] = [
+        tools_module.ai_open_url,
+        tools_module.ai_fetch_url,
+        tools_module.git_commit_tool,
+        tools_module.ai_display_image_in_terminal,
+        tools_module.ai_youtube_get_transcript,
+        # tools_module.ai_joke,
+    ]  # type: ignore
+
+    found = {match.lower() for match in _KEYWORD_RE.findall(question)}
+    for spec in _TOOL_REGISTRY:
+        if spec.matches(found):
+            ai_tools.extend(getattr(tools_module, tool_name) for tool_name in spec.tool_names)
+
+    if repl:
+        # modules are only imported when REPL code first references them
+        local_modules = LazyModuleDict(REPL_MODULE_NAMES, loaders={"clipman": get_clipboard})
+        ai_tools.append(
+            ParPythonAstREPLTool(prompt_before_exec=not yes_to_all, show_exec_code=True, locals=local_modules),
+        )
+
+    # use TavilySearchResults with fallback to serper and google search if api keys are set
+    if os.environ.get("TAVILY_API_KEY"):
+        ai_tools.append(
+            TavilySearchResults(
+                max_results=3,
+                include_answer=True,
+                topic="news",  # type: ignore
+                name="tavily_news_results_json",
+                description="Search news and current events",
+            )
+        )
+        ai_tools.append(
+            TavilySearchResults(
+                max_results=3,
+                include_answer=True,
+                name="tavily_search_results_json",
+                description="General search for content not directly related to current events",
+            )
+        )
+    elif os.environ.get("SERPER_API_KEY"):
+        ai_tools.append(tools_module.ai_serper_search)
+    elif os.environ.get("GOOGLE_CSE_ID") and os.environ.get("GOOGLE_CSE_API_KEY"):
+        ai_tools.append(web_search)  # type: ignore
+
+    return ai_tools
+
+
+def load_context(context_location: str, context_path: Path | None) -> tuple[str, bool]:
+    """Load context from a URL or from context_path if set, images are base64 encoded.
+
+    Returns:
+        tuple[str, bool]: The context and whether it is an image
+    """
+    try:
+        image_type = try_get_image_type(context_location)
+        image_path = context_path or download_cache.download(context_location)
+        context = image_to_base64(image_path.read_bytes(), image_type)
+    except UnsupportedImageTypeError as _:
+        if context_path:
+            return context_path.read_text(encoding="utf-8").strip(), False
+        from par_ai_core.web_tools import fetch_url_and_convert_to_markdown
+
+        return fetch_url_and_convert_to_markdown(context_location)[0].strip(), False
+    show_image_in_terminal(image_path)
+    return context, True
+
+
+def handle_commit(
+    question: str,
+    *,
+    llm_config: LlmConfig,
+    file_args: list[str],
+    context: str,
+    debug: bool,
+    show_tool_calls: bool,
+    pricing: PricingDisplay,
+) -> None:
+    """Generate and show or make a git commit for the current repo."""
+    from .repo.repo import GitRepo
+
+    with get_parai_callback(show_end=debug, show_tool_calls=debug or show_tool_calls, show_pricing=pricing):
+        repo = GitRepo(llm_config=llm_config)
+        if not repo.is_dirty():
+            console.print("[bold yellow]No changes to commit. Exiting...")
+            return
+        if _SHOW_COMMIT_RE.match(question):
+            console.print(repo.get_commit_message(repo.get_diffs(file_args), context=context))
+        else:
+            repo.commit(file_args, context=context)
+
+
+@functools.cache
+def _ensure_env_loaded() -> None:
+    """Load environment variables from .env files unless disabled with PARGPT_SKIP_DOTENV."""
+    if os.environ.get(f"{__env_var_prefix__}_SKIP_DOTENV"):
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    user_env_file = Path(f"~/.{__application_binary__}.env").expanduser()
+    if user_env_file.exists():
+        load_dotenv(user_env_file)
 
 
 def version_callback(value: bool) -> None:
@@ -259,6 +433,22 @@ def main(
             help="Disable REPL tool",
         ),
     ] = False,
+    parallel_tools: Annotated[
+        bool,
+        typer.Option(
+            "--parallel-tools",
+            envvar=f"{__env_var_prefix__}_PARALLEL_TOOLS",
+            help="Run independent tool calls concurrently when in agent mode. Not used when the REPL tool is enabled.",
+        ),
+    ] = False,
+    llm_cache: Annotated[
+        bool,
+        typer.Option(
+            "--llm-cache",
+            envvar=f"{__env_var_prefix__}_LLM_CACHE",
+            help="Cache LLM responses on disk. Only used when temperature is 0, env context then has the date only.",
+        ),
+    ] = False,
     version: Annotated[
         bool | None,
         typer.Option("--version", "-v", callback=version_callback, is_eager=True),
@@ -273,20 +463,24 @@ def main(
     #     typer.echo(f"Got extra arg: {unknown_arg}")
     # return
     try:
-        if ai_provider not in [LlmProvider.OLLAMA, LlmProvider.LLAMACPP, LlmProvider.BEDROCK]:
-            key_name = provider_env_key_names[ai_provider]
-            if not os.environ.get(key_name):
+        if ai_provider not in _NO_API_KEY_PROVIDERS:
+            key_name = provider_env_key_names.get(ai_provider)
+            if key_name and not os.environ.get(key_name):
                 console.print(f"[bold red]{key_name} environment variable not set. Exiting...")
                 raise typer.Exit(1)
         if copy_from_clipboard:
-            context_location = clipboard.paste()
+            context_location = get_clipboard().paste()
             console.print("[bold green]Context copied from clipboard")
 
         context_is_url: bool = context_location.startswith("http")
         if context_is_url:
             console.print("[bold green]Context is URL and will be downloaded")
 
-        context_is_file: bool = not context_is_url and "\n" not in context_location and Path(context_location).is_file()
+        # only build and stat a path for values that could name a file
+        context_path: Path | None = (
+            Path(context_location) if context_location and not context_is_url and "\n" not in context_location else None
+        )
+        context_is_file: bool = context_path is not None and context_path.is_file()
         if context_is_file:
             console.print("[bold green]Context is file and will be read")
 
@@ -299,34 +493,33 @@ def main(
             context = context_location
             context_location = ""
 
-        sio_all: StringIO = StringIO()
-
         if not context_location and not copy_from_clipboard and has_stdin_content():
             console.print("[bold green]Context is stdin and will be read")
-            for line in sys.stdin:
-                sio_all.write(line)
-            context = sio_all.getvalue().strip()
+            max_stdin_bytes_var = f"{__env_var_prefix__}_MAX_STDIN_BYTES"
+            try:
+                max_stdin_bytes = int(os.environ.get(max_stdin_bytes_var) or 0)
+            except ValueError:
+                max_stdin_bytes = -1
+            if max_stdin_bytes < 0:
+                console.print(f"[bold red]{max_stdin_bytes_var} must be a whole number of bytes. Exiting...")
+                raise typer.Exit(1)
+            truncated = False
+            if max_stdin_bytes > 0:
+                raw_context = sys.stdin.buffer.read(max_stdin_bytes + 1)
+                if len(raw_context) > max_stdin_bytes:
+                    console.print(f"[bold yellow]Context from stdin truncated to {max_stdin_bytes} bytes")
+                    raw_context = raw_context[:max_stdin_bytes]
+                    truncated = True
+            else:
+                raw_context = sys.stdin.buffer.read()
+            # a non final decode drops a multibyte character cut by the limit instead of replacing it
+            context = codecs.getincrementaldecoder("utf-8")(errors="replace").decode(raw_context, final=not truncated)
+            # match the universal newline handling of text mode stdin
+            context = context.replace("\r\n", "\n").replace("\r", "\n").strip()
 
         context_is_image = False
         if context_location:
-            if context_is_url:
-                try:
-                    image_type = try_get_image_type(context_location)
-                    image_path = download_cache.download(context_location)
-                    context = image_to_base64(image_path.read_bytes(), image_type)
-                    context_is_image = True
-                    show_image_in_terminal(image_path)
-                except UnsupportedImageTypeError as _:
-                    context = fetch_url_and_convert_to_markdown(str(context_location))[0].strip()
-            else:
-                try:
-                    image_type = try_get_image_type(context_location)
-                    image_path = Path(context_location)
-                    context = image_to_base64(image_path.read_bytes(), image_type)
-                    context_is_image = True
-                    show_image_in_terminal(image_path)
-                except UnsupportedImageTypeError as _:
-                    context = Path(context_location).read_text(encoding="utf-8").strip()
+            context, context_is_image = load_context(context_location, context_path)
 
         if not model:
             if light_model:
@@ -346,10 +539,10 @@ def main(
             raise typer.Exit(1)
 
         question = user_prompt or context
-        if re.match(r"(get|show|list|display) (env|environment|extra context)", question, flags=re.IGNORECASE):
+        if _ENV_CONTEXT_RE.match(question):
             console.print(Markdown(mk_env_context()))
             return
-        if re.match(r"(git|gen|generate|create|do|show|display) commit", question, flags=re.IGNORECASE):
+        if _COMMIT_RE.match(question):
             llm_config = LlmConfig(
                 provider=ai_provider,
                 model_name=model,
@@ -361,70 +554,49 @@ def main(
                 env_prefix=__env_var_prefix__,
                 base_url=ai_base_url,
             ).set_env()
-            with get_parai_callback(show_end=debug, show_tool_calls=debug or show_tool_calls, show_pricing=pricing):
-                repo = GitRepo(llm_config=llm_config)
-                if not repo.is_dirty():
-                    console.print("[bold yellow]No changes to commit. Exiting...")
-                    return
-                # console.print(repo.get_dirty_files())
-                # return
-                if re.match(r"(display|show)\s?(git|gen|generate|create|do)? commit", question, flags=re.IGNORECASE):
-                    console.print(repo.get_commit_message(repo.get_diffs(unknown_args.args), context=context))
-                else:
-                    repo.commit(unknown_args.args, context=context)
-                return
+            handle_commit(
+                question,
+                llm_config=llm_config,
+                file_args=unknown_args.args,
+                context=context,
+                debug=debug,
+                show_tool_calls=show_tool_calls,
+                pricing=pricing,
+            )
+            return
 
         if user_prompt and context and not context_is_image:
-            question = "\n<context>\n" + context + "\n</context>\n" + question
+            question = f"\n<context>\n{context}\n</context>\n{question}"
 
         if show_config:
-            console.print(
-                Panel.fit(
-                    Text.assemble(
-                        ("AI Provider: ", "cyan"),
-                        (f"{ai_provider.value}", "green"),
-                        "\n",
-                        ("Light Model: ", "cyan"),
-                        (f"{light_model}", "green"),
-                        "\n",
-                        ("Model: ", "cyan"),
-                        (f"{model}", "green"),
-                        "\n",
-                        ("AI Provider Base URL: ", "cyan"),
-                        (f"{ai_base_url or 'default'}", "green"),
-                        "\n",
-                        ("Temperature: ", "cyan"),
-                        (f"{temperature}", "green"),
-                        "\n",
-                        ("System Prompt: ", "cyan"),
-                        (f"{system_prompt or 'default'}", "green"),
-                        "\n",
-                        ("User Prompt: ", "cyan"),
-                        (f"{user_prompt or 'using stdin'}", "green"),
-                        "\n",
-                        ("Pricing: ", "cyan"),
-                        (f"{pricing}", "green"),
-                        "\n",
-                        ("Display Format: ", "cyan"),
-                        (f"{display_format or 'default'}", "green"),
-                        "\n",
-                        ("Context Location: ", "cyan"),
-                        (f"{context_location or 'default'}", "green"),
-                        "\n",
-                        ("Context Is Image: ", "cyan"),
-                        (f"{context_is_image}", "green"),
-                        "\n",
-                        ("Agent Mode: ", "cyan"),
-                        (f"{agent_mode}", "green"),
-                        "\n",
-                        ("Debug: ", "cyan"),
-                        (f"{debug}", "green"),
-                        "\n",
-                    ),
-                    title="[bold]GPT Configuration",
-                    border_style="bold",
-                )
-            )
+            config_rows: list[tuple[str, object]] = [
+                ("AI Provider", ai_provider.value),
+                ("Light Model", light_model),
+                ("Model", model),
+                ("AI Provider Base URL", ai_base_url or "default"),
+                ("Temperature", temperature),
+                ("System Prompt", system_prompt or "default"),
+                ("User Prompt", user_prompt or "using stdin"),
+                ("Pricing", pricing),
+                ("Display Format", display_format or "default"),
+                ("Context Location", context_location or "default"),
+                ("Context Is Image", context_is_image),
+                ("Agent Mode", agent_mode),
+                ("Debug", debug),
+            ]
+            config_table = Table.grid(padding=(0, 1))
+            config_table.add_column(style="cyan")
+            config_table.add_column(style="green")
+            for label, value in config_rows:
+                # values are wrapped in Text so they are not parsed as markup
+                config_table.add_row(f"{label}:", Text(str(value)))
+            console.print(Panel.fit(config_table, title="[bold]GPT Configuration", border_style="bold"))
+
+        use_llm_cache = llm_cache and temperature == 0
+        if use_llm_cache:
+            enable_llm_cache()
+        elif llm_cache:
+            console.print("[bold yellow]LLM cache is only used when temperature is 0")
 
         llm_config = LlmConfig(
             provider=ai_provider,
@@ -439,131 +611,39 @@ def main(
 
         chat_model = llm_config.build_chat_model()
         question = question.strip()
-        question_lower = question.lower()
+        # feature keywords are user directives, so scan the prompt rather than a possibly large context
+        directive_lower = (user_prompt or question).lower()
 
-        env_info = mk_env_context({}, console)
         with get_parai_callback(show_end=debug, show_tool_calls=debug or show_tool_calls) as cb:
             if agent_mode:
-                module_names = [
-                    "os",
-                    "sys",
-                    "re",
-                    "json",
-                    "time",
-                    "datetime",
-                    "random",
-                    "string",
-                    "pathlib",
-                    "requests",
-                    "git",
-                    "pandas",
-                    "faker",
-                    "numpy",
-                    "matplotlib",
-                    "bs4",
-                    "html2text",
-                    "pydantic",
-                    "clipman",
-                    "pyfiglet",
-                    "rich",
-                    # "rich.console",
-                    "rich.panel",
-                    "rich.markdown",
-                    "rich.pretty",
-                    "rich.table",
-                    "rich.text",
-                    "rich.color",
-                ]
-                local_modules = {module_name: importlib.import_module(module_name) for module_name in module_names}
-
-                ai_tools: list[BaseTool] = [
-                    ai_open_url,
-                    ai_fetch_url,
-                    git_commit_tool,
-                    ai_display_image_in_terminal,
-                    ai_youtube_get_transcript,
-                    # ai_joke,
-                ]  # type: ignore
-
-                if "figlet" in question_lower:
-                    ai_tools.append(ai_figlet)
-
-                if not no_repl:
-                    ai_tools.append(
-                        ParPythonAstREPLTool(
-                            prompt_before_exec=not yes_to_all, show_exec_code=True, locals=local_modules
-                        ),
-                    )
-
-                if os.environ.get("GOOGLE_API_KEY") and "youtube" in question_lower:
-                    ai_tools.append(ai_youtube_search)
-
-                # use TavilySearchResults with fallback to serper and google search if api keys are set
-                if os.environ.get("TAVILY_API_KEY"):
-                    ai_tools.append(
-                        TavilySearchResults(
-                            max_results=3,
-                            include_answer=True,
-                            topic="news",  # type: ignore
-                            name="tavily_news_results_json",
-                            description="Search news and current events",
-                        )
-                    )
-                    ai_tools.append(
-                        TavilySearchResults(
-                            max_results=3,
-                            include_answer=True,
-                            name="tavily_search_results_json",
-                            description="General search for content not directly related to current events",
-                        )
-                    )
-                elif os.environ.get("SERPER_API_KEY"):
-                    ai_tools.append(ai_serper_search)
-                elif os.environ.get("GOOGLE_CSE_ID") and os.environ.get("GOOGLE_CSE_API_KEY"):
-                    ai_tools.append(web_search)  # type: ignore
-
-                if os.environ.get("BRAVE_API_KEY"):
-                    ai_tools.append(ai_brave_search)
-
-                if os.environ.get("REDDIT_CLIENT_ID") and os.environ.get("REDDIT_CLIENT_SECRET"):
-                    ai_tools.append(ai_reddit_search)
-
-                if "clipboard" in question_lower:
-                    ai_tools.append(ai_copy_to_clipboard)
-                    ai_tools.append(ai_copy_from_clipboard)
-
-                if os.environ.get("WEATHERAPI_KEY") and ("weather" in question_lower or " wx " in question_lower):
-                    ai_tools.append(ai_get_weather_current)
-                    ai_tools.append(ai_get_weather_forecast)
-                if os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN") and "github" in question_lower:
-                    ai_tools.append(ai_github_list_repos)
-                    ai_tools.append(ai_github_create_repo)
-                    ai_tools.append(ai_github_publish_repo)
+                from .agents import do_tool_agent
 
+                ai_tools = build_ai_tool_list(user_prompt or question, repl=not no_repl, yes_to_all=yes_to_all)
                 content, result = do_tool_agent(
                     chat_model=chat_model,
                     ai_tools=ai_tools,
-                    modules=module_names,
-                    env_info=env_info,
+                    modules=REPL_MODULE_NAMES,
+                    env_info=mk_env_context(console=console, stable=use_llm_cache),
                     user_input=question,
                     image=context if context_is_image else None,
                     system_prompt=system_prompt,
                     max_iterations=max_iterations,
+                    parallel_tools=parallel_tools,
                     debug=debug,
                     console=console,
                 )
             else:
-                if "code review" in question_lower:
+                if "code review" in directive_lower:
                     content, result = do_code_review_agent(
                         chat_model=chat_model,
                         user_input=question,
                         system_prompt=system_prompt,
-                        env_info=env_info,
+                        env_info=mk_env_context(console=console, stable=use_llm_cache),
                         display_format=display_format,
                         debug=debug,
                         console=console,
                     )
-                elif "generate prompt" in question_lower:
+                elif "generate prompt" in directive_lower:
                     content, result = do_prompt_generation_agent(
                         chat_model=chat_model,
                         user_input=question,
@@ -572,12 +652,14 @@ def main(
                         console=console,
                     )
                 else:
+                    # env context is sent alongside the system prompt so skip building it when there is none
+                    no_system_prompt = not supports_system_prompt(chat_model)
                     content, result = do_single_llm_call(
                         chat_model=chat_model,
                         user_input=question,
                         system_prompt=system_prompt,
-                        no_system_prompt=chat_model.name is not None and chat_model.name.startswith("o1"),
-                        env_info=env_info,
+                        no_system_prompt=no_system_prompt,
+                        env_info=None if no_system_prompt else mk_env_context(console=console, stable=use_llm_cache),
                         image=context if context_is_image else None,
                         display_format=display_format,
                         debug=debug,
@@ -587,10 +669,15 @@ def main(
             usage_metadata = cb.usage_metadata
 
         if not sys.stdout.isatty():
-            print(content)
+            # write the encoded content in one call rather than through text io line handling,
+            # flushing first so text already printed by tools such as the REPL comes out before it
+            sys.stdout.flush()
+            output = content.encode("utf-8", errors="replace")
+            sys.stdout.buffer.write(output if output.endswith(b"\n") else output + b"\n")
+            sys.stdout.buffer.flush()
 
         if copy_to_clipboard:
-            clipboard.copy(content)
+            get_clipboard().copy(content)
             console.print("[bold green]Copied to clipboard")
 
         if debug:
@@ -606,5 +693,12 @@ def main(
         raise typer.Exit(code=1)
 
 
-if __name__ == "__main__":
+def run() -> None:
+    """CLI entry point."""
+    # options read their env vars while the command line is parsed, so .env files must be loaded before app()
+    _ensure_env_loaded()
     app()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,25 @@
+"""Deferred package initialization."""
+
+from __future__ import annotations
+
+import functools
+import os
+import warnings
+
+from . import __application_title__, __version__
+
+
+def _configure_warnings() -> None:
+    """Silence LangChain deprecation and beta warnings."""
+    from langchain._api import LangChainDeprecationWarning
+    from langchain_core._api import LangChainBetaWarning
+
+    warnings.simplefilter("ignore", category=LangChainDeprecationWarning)
+    warnings.simplefilter("ignore", category=LangChainBetaWarning)
+
+
+@functools.cache
+def ensure_initialized() -> None:
+    """Run one time package setup. Safe to call multiple times."""
+    os.environ["USER_AGENT"] = f"{__application_title__} {__version__}"
+    _configure_warnings()
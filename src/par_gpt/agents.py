@@ -2,16 +2,13 @@
 
 from __future__ import annotations
 
-import copy
+import asyncio
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from langchain.agents import AgentExecutor, create_react_agent, create_tool_calling_agent
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
-from langchain_core.tools import BaseTool
-from langchain_groq import ChatGroq
 from par_ai_core.llm_config import llm_run_manager
 from par_ai_core.llm_image_utils import image_to_chat_message
 from par_ai_core.output_utils import DisplayOutputFormat, get_output_format_prompt
@@ -28,6 +25,40 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.pretty import Pretty
 
+if TYPE_CHECKING:
+    from langchain_core.tools import BaseTool
+
+# model name prefixes for models that do not accept a system prompt
+NO_SYSTEM_PROMPT_MODEL_PREFIXES = ("o1",)
+
+
+def supports_system_prompt(chat_model: BaseChatModel) -> bool:
+    """Return False if the chat model does not accept a system prompt."""
+    return not (chat_model.name and chat_model.name.startswith(NO_SYSTEM_PROMPT_MODEL_PREFIXES))
+
+
+def strip_markdown_fence(content: str) -> str:
+    """Remove a plain or markdown code fence wrapping the whole response, keeping fenced blocks inside it."""
+    content = content.strip()
+    lines = content.split("\n")
+    if len(lines) < 2 or not lines[0].startswith("```") or lines[-1].strip() != "```":
+        return content
+    # a fence tagged with another language is real code, not a wrapper
+    if lines[0].removeprefix("```").strip().lower() not in {"", "markdown"}:
+        return content
+    # tagged fences open inner blocks and bare fences close them, the wrapper must close on the last line
+    depth = 1
+    for line in lines[1:-1]:
+        line = line.strip()
+        if not line.startswith("```"):
+            continue
+        depth += 1 if line.removeprefix("```").strip() else -1
+        if depth == 0:
+            return content
+    if depth != 1:
+        return content
+    return "\n".join(lines[1:-1]).strip()
+
 
 def do_single_llm_call(
     *,
@@ -58,21 +89,27 @@ def do_single_llm_call(
             chat_history.append(("user", env_info))
 
         # Groq does not support images if a system prompt is specified
-        if isinstance(chat_model, ChatGroq) and image:
-            chat_history.pop(0)
+        if image:
+            from langchain_groq import ChatGroq
+
+            if isinstance(chat_model, ChatGroq):
+                chat_history.pop(0)
 
-    chat_history_debug = copy.deepcopy(chat_history)
     if image:
         chat_history.append(("user", [{"type": "text", "text": user_input}, image_to_chat_message(image)]))
-        chat_history_debug.append(("user", [{"type": "text", "text": user_input}, ({"IMAGE": "DATA"})]))
     else:
         chat_history.append(("user", user_input))
-        chat_history_debug.append(("user", user_input))
 
     if debug:
+        # history entries are never mutated so the debug view can share them, only the image data is masked
+        chat_history_debug = chat_history
+        if image:
+            chat_history_debug = chat_history[:-1] + [
+                ("user", [{"type": "text", "text": user_input}, {"IMAGE": "DATA"}])
+            ]
         console.print(Panel.fit(Pretty(chat_history_debug), title="GPT Prompt"))
     result = chat_model.invoke(chat_history, config=llm_run_manager.get_runnable_config(chat_model.name))  # type: ignore
-    content = str(result.content).replace("```markdown", "").replace("```", "").strip()
+    content = strip_markdown_fence(str(result.content))
     result.content = content
     return content, result
 
@@ -128,6 +165,8 @@ Begin!
         """
     )
 
+    from langchain.agents import AgentExecutor, create_react_agent
+
     prompt_template = PromptTemplate.from_template(system_prompt or default_system_prompt)
     agent = create_react_agent(chat_model, ai_tools, prompt_template)
     agent_executor = AgentExecutor(
@@ -140,7 +179,7 @@ Begin!
     if debug:
         console.print(Panel.fit(default_system_prompt, title="GPT Prompt"))
     result = agent_executor.invoke({"question": question}, config=llm_run_manager.get_runnable_config(chat_model.name))
-    content = str(result["output"]).replace("```markdown", "").replace("```", "").strip()
+    content = strip_markdown_fence(str(result["output"]))
     result["output"] = content
     return content, result
 
@@ -155,6 +194,7 @@ def do_tool_agent(
     system_prompt: str | None,
     image: str | None = None,
     max_iterations: int = 5,
+    parallel_tools: bool = False,
     debug: bool = True,
     verbose: bool = False,
     console: Console | None = None,
@@ -232,6 +272,9 @@ def do_tool_agent(
     prompt = system_prompt or default_system_prompt
     if "{agent_scratchpad}" not in prompt:
         prompt += "\n<agent_scratchpad>\n{agent_scratchpad}\n</agent_scratchpad>\n"
+
+    from langchain.agents import AgentExecutor, create_tool_calling_agent
+
     prompt_template = ChatPromptTemplate.from_template(prompt)
     agent = create_tool_calling_agent(chat_model, ai_tools, prompt_template)
     agent_executor = AgentExecutor(
@@ -246,14 +289,27 @@ def do_tool_agent(
     args = {"user_input": user_input, "module_text": module_text, "env_info": env_info}
     if debug:
         console.print(Panel.fit(prompt_template.format(**args, agent_scratchpad=""), title="GPT Prompt"))
-    result = agent_executor.invoke(args, config=llm_run_manager.get_runnable_config(chat_model.name))
+    config = llm_run_manager.get_runnable_config(chat_model.name)
+    if parallel_tools:
+        from .ai_tools.par_python_repl import ParPythonAstREPLTool, ParPythonREPLTool
+
+        # the REPL captures output by swapping the process wide sys.stdout / sys.stderr,
+        # which would also capture console output of tools running alongside it
+        if any(isinstance(tool, ParPythonAstREPLTool | ParPythonREPLTool) for tool in ai_tools):
+            console.print("[bold yellow]Python REPL tool is enabled, running tool calls sequentially")
+            parallel_tools = False
+    if parallel_tools:
+        # the async executor gathers all tool calls from a single model response concurrently
+        result = asyncio.run(agent_executor.ainvoke(args, config=config))
+    else:
+        result = agent_executor.invoke(args, config=config)
     # if debug:
     #     io.print(Panel.fit(Pretty(result), title="GPT Response))
     if isinstance(result["output"], str):
         content = result["output"]
     else:
         content = result["output"][0]["text"]
-    content = content.replace("```markdown", "").replace("```", "").strip()
+    content = strip_markdown_fence(content)
     return content, result
 
 
@@ -303,7 +359,7 @@ def do_prompt_generation_agent(
 
     prompt = system_prompt or (Path(__file__).parent / "prompts" / "meta_prompt.xml").read_text(encoding="utf-8")
     prompt_template = ChatPromptTemplate.from_template(prompt)
-    if chat_model.name and chat_model.name.startswith("o1"):
+    if not supports_system_prompt(chat_model):
         return do_single_llm_call(
             chat_model=chat_model,
             user_input=prompt_template.format(user_input=user_input),
@@ -7,7 +7,6 @@ import webbrowser
 from pathlib import Path
 from typing import Any, Literal, cast
 
-import clipman as clipboard
 from git import Remote
 from github import Auth, AuthenticatedUser, Github
 from langchain_core.tools import tool
@@ -22,6 +21,7 @@ from par_gpt.utils import (
     FigletFontName,
     figlet_horizontal,
     figlet_vertical,
+    get_clipboard,
     get_weather_current,
     get_weather_forecast,
     show_image_in_terminal,
@@ -85,7 +85,7 @@ def ai_copy_to_clipboard(text: str) -> str:
         "Text copied to clipboard"
     """
 
-    clipboard.copy(text)
+    get_clipboard().copy(text)
     return "Text copied to clipboard"
 
 
@@ -99,7 +99,7 @@ def ai_copy_from_clipboard() -> str:
         Any text that was copied from the clipboard.
     """
 
-    return clipboard.paste() or ""
+    return get_clipboard().paste() or ""
 
 
 @tool(parse_docstring=True)
@@ -1,9 +1,13 @@
 """Python REPL tool. Adapted from Langchain PythonAstREPLTool."""
 
 import ast
+import importlib
 import re
+import threading
+from collections.abc import Callable
 from contextlib import redirect_stderr, redirect_stdout
 from io import StringIO
+from types import ModuleType
 from typing import Any
 
 from langchain.callbacks.manager import (
@@ -13,15 +17,47 @@ from langchain.callbacks.manager import (
 from langchain_core.runnables.config import run_in_executor
 from langchain_core.tools import BaseTool
 from par_ai_core.par_logging import console_err
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 from rich.console import Console
 from rich.prompt import Prompt
 
+# serializes prompts and execution if the tool is called from several threads,
+# the tool agent does not run other tools concurrently with it as output capture swaps the global streams
+_exec_lock = threading.Lock()
+
 
 class AbortedByUserError(Exception):
     """Raised when user aborts."""
 
 
+class LazyModuleDict(dict):
+    """REPL locals that import modules the first time they are referenced.
+
+    Dotted module names are imported together with their top level package so that
+    attribute access such as rich.panel.Panel works once rich is referenced.
+    """
+
+    def __init__(self, module_names: list[str], loaders: dict[str, Callable[[], ModuleType]] | None = None) -> None:
+        """Initialize with the module names to expose and optional custom loaders keyed by module name."""
+        super().__init__()
+        self.module_names = module_names
+        self.loaders = loaders or {}
+
+    def _load(self, module_name: str) -> ModuleType:
+        loader = self.loaders.get(module_name)
+        return loader() if loader else importlib.import_module(module_name)
+
+    def __missing__(self, key: str) -> ModuleType:
+        submodules = [module_name for module_name in self.module_names if module_name.startswith(key + ".")]
+        if key not in self.module_names and not submodules:
+            raise KeyError(key)
+        module = self._load(key)
+        for module_name in submodules:
+            self._load(module_name)
+        self[key] = module
+        return module
+
+
 def sanitize_input(query: str) -> str:
     """Sanitize input to the python REPL.
 
@@ -59,7 +95,8 @@ class ParPythonAstREPLTool(BaseTool):
         "make sure it does not look abbreviated before using it in your answer."
     )
     globals: dict | None = Field(default_factory=dict)  # type: ignore
-    locals: dict | None = Field(default_factory=dict)  # type: ignore
+    locals: SkipValidation[dict | None] = Field(default_factory=dict)  # type: ignore
+    """Locals are not validated so a LazyModuleDict is used as is instead of being copied."""
     args_schema: type[BaseModel] = PythonInputs
 
     sanitize_input: bool = True
@@ -89,51 +126,52 @@ class ParPythonAstREPLTool(BaseTool):
         """
         if not self.console:
             self.console = console_err
-        if not self.locals:
+        if self.locals is None:
             self.locals = {}
         if "console" not in self.locals:
             self.locals["console"] = self.console
-        try:
-            if self.sanitize_input:
-                query = sanitize_input(query)
-            if self.prompt_before_exec:
-                ans = Prompt.ask(
-                    f"Execute>>>\n[yellow]{query}[/yellow]\n<<<[[green]Y[/green]/[red]n[/red]] ? ",
-                    default="y",
-                    console=self.console,
-                )
-                if ans.lower() not in ["y", "yes", ""]:
-                    raise (AbortedByUserError("Tool aborted by user."))
-            elif self.show_exec_code:
-                self.console.print(f"Executing>>>\n[yellow]{query}[/yellow]\n")
-
-            tree = ast.parse(query)
-            module = ast.Module(tree.body[:-1], type_ignores=[])
-            exec(ast.unparse(module), self.globals, self.locals)  # type: ignore
-            module_end = ast.Module(tree.body[-1:], type_ignores=[])
-            module_end_str = ast.unparse(module_end)  # type: ignore
-            io_buffer = StringIO()
+        with _exec_lock:
             try:
-                with redirect_stdout(io_buffer):
-                    with redirect_stderr(io_buffer):
-                        ret = eval(module_end_str, self.globals, self.locals)
-                if ret is None:
+                if self.sanitize_input:
+                    query = sanitize_input(query)
+                if self.prompt_before_exec:
+                    ans = Prompt.ask(
+                        f"Execute>>>\n[yellow]{query}[/yellow]\n<<<[[green]Y[/green]/[red]n[/red]] ? ",
+                        default="y",
+                        console=self.console,
+                    )
+                    if ans.lower() not in {"y", "yes", ""}:
+                        raise (AbortedByUserError("Tool aborted by user."))
+                elif self.show_exec_code:
+                    self.console.print(f"Executing>>>\n[yellow]{query}[/yellow]\n")
+
+                tree = ast.parse(query)
+                module = ast.Module(tree.body[:-1], type_ignores=[])
+                exec(ast.unparse(module), self.globals, self.locals)  # type: ignore
+                module_end = ast.Module(tree.body[-1:], type_ignores=[])
+                module_end_str = ast.unparse(module_end)  # type: ignore
+                io_buffer = StringIO()
+                try:
+                    with redirect_stdout(io_buffer):
+                        with redirect_stderr(io_buffer):
+                            ret = eval(module_end_str, self.globals, self.locals)
+                    if ret is None:
+                        ret = io_buffer.getvalue()
+                except Exception as _:
+                    with redirect_stdout(io_buffer):
+                        with redirect_stderr(io_buffer):
+                            exec(module_end_str, self.globals, self.locals)
                     ret = io_buffer.getvalue()
-            except Exception as _:
-                with redirect_stdout(io_buffer):
-                    with redirect_stderr(io_buffer):
-                        exec(module_end_str, self.globals, self.locals)
-                ret = io_buffer.getvalue()
-            if self.show_exec_code and self.console:
-                self.console.print("[blue]Result>>>")
-                print(ret)
-            return ret
-        except Exception as e:
-            msg = f"{type(e).__name__}: {str(e)}"
-            if self.console:
-                self.console.print("[bold red]Error:")
-                self.console.print(msg, markup=False)
-            return msg
+                if self.show_exec_code and self.console:
+                    self.console.print("[blue]Result>>>")
+                    print(ret)
+                return ret
+            except Exception as e:
+                msg = f"{type(e).__name__}: {str(e)}"
+                if self.console:
+                    self.console.print("[bold red]Error:")
+                    self.console.print(msg, markup=False)
+                return msg
 
     async def _arun(
         self,
@@ -200,7 +238,7 @@ class ParPythonREPLTool(BaseTool):
                     default="y",
                     console=self.console,
                 )
-                if ans.lower() not in ["y", "yes", ""]:
+                if ans.lower() not in {"y", "yes", ""}:
                     raise AbortedByUserError("Tool aborted by user.")
             elif self.show_exec_code:
                 self.console.print(f"Executing>>>\n[yellow]{query}[/yellow]\n")
@@ -0,0 +1,18 @@
+"""Console script entry point."""
+
+from __future__ import annotations
+
+import sys
+
+from . import __application_title__, __version__
+
+
+def run() -> None:
+    """Answer a bare version request before typer and the llm stack are imported, otherwise run the app."""
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        print(f"{__application_title__}: {__version__}")
+        return
+
+    from .__main__ import run as run_app
+
+    run_app()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import getpass
 import hashlib
 import os
@@ -10,20 +11,39 @@ from contextlib import redirect_stderr, redirect_stdout
 from datetime import UTC, datetime
 from io import StringIO
 from pathlib import Path
+from types import ModuleType
 from typing import Any, Literal
 from urllib.parse import urlparse
 
-import orjson as json
-import pyfiglet
 import requests
 from par_ai_core.par_logging import console_err
 from par_ai_core.user_agents import get_random_user_agent
+from requests.adapters import HTTPAdapter
 from rich.console import Console
-from rich_pixels import Pixels
 
 from . import __application_binary__
 
 
+@functools.cache
+def get_http_session() -> requests.Session:
+    """Shared HTTP session so repeated requests reuse pooled keep-alive connections."""
+    session = requests.Session()
+    # parallel tool calls may hit the same host from several threads at once
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@functools.cache
+def get_clipboard() -> ModuleType:
+    """Import and initialize the clipboard backend on first use."""
+    import clipman
+
+    clipman.init()
+    return clipman
+
+
 def get_url_file_suffix(url: str) -> str:
     """
     Get url file suffix
@@ -65,7 +85,7 @@ class DownloadCache:
         path = self.get_path(url)
         if not force and path.exists():
             return path
-        response = requests.get(
+        response = get_http_session().get(
             url,
             timeout=timeout,
             allow_redirects=True,
@@ -84,6 +104,23 @@ class DownloadCache:
 download_cache = DownloadCache()
 
 
+def enable_llm_cache(database_path: str | Path | None = None) -> None:
+    """
+    Enable the persistent LangChain LLM response cache.
+
+    Args:
+        database_path (str | Path | None): SQLite database to use. Defaults to ~/.par_gpt/llm_cache.sqlite
+    """
+    from langchain_community.cache import SQLiteCache
+    from langchain_core.globals import set_llm_cache
+
+    if not database_path:
+        database_path = Path(f"~/.{__application_binary__}/llm_cache.sqlite").expanduser()
+    database_path = Path(database_path)
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=str(database_path)))
+
+
 def safe_abs_path(res):
     """Gives an abs path, which safely returns a full (not 8.3) windows path"""
     return str(Path(res).resolve())
@@ -103,7 +140,7 @@ def get_weather_current(location: str, timeout: int = 10) -> dict[str, Any]:
     if location == "auto":
         location = "auto:ip"
 
-    response = requests.get(
+    response = get_http_session().get(
         f"https://api.weatherapi.com/v1/current.json?key={os.environ.get('WEATHERAPI_KEY')}&q={location}&aqi=no",
         timeout=timeout,
     )
@@ -125,7 +162,7 @@ def get_weather_forecast(location: str, num_days: int, timeout: int = 10) -> dic
     if location == "auto":
         location = "auto:ip"
 
-    response = requests.get(
+    response = get_http_session().get(
         f"https://api.weatherapi.com/v1/forecast.json?key={os.environ.get('WEATHERAPI_KEY')}&q={location}&days={num_days}&aqi=no&alerts=no",
         timeout=timeout,
     )
@@ -149,15 +186,16 @@ def show_image_in_terminal(image_path: str | Path, dimension: str = "auto", cons
     if not image_path:
         return "Image not found"
     try:
+        from rich_pixels import Pixels
+
         image_path = str(image_path)
         if image_path.startswith("//"):
             image_path = "https:" + image_path
         if image_path.startswith("http"):
             image_path = download_cache.download(image_path)
 
-        if dimension in ["auto", "small", "medium", "large"]:
-            width = console.width
-            height = console.height
+        if dimension in {"auto", "small", "medium", "large"}:
+            width, height = console.size
             if dimension == "small":
                 width = width // 3
                 height = height // 3
@@ -181,7 +219,21 @@ def show_image_in_terminal(image_path: str | Path, dimension: str = "auto", cons
         return f"Error: {str(e)}"
 
 
-def mk_env_context(extra_context: dict[str, Any] | str | Path | None = None, console: Console | None = None) -> str:
+@functools.cache
+def _static_env_context() -> dict[str, str]:
+    """Environment context values that do not change for the life of the process."""
+    return {
+        "username": getpass.getuser(),
+        "home_directory": Path("~").expanduser().as_posix(),
+        "platform": platform.platform(aliased=True, terse=True),
+        "shell": Path(os.environ.get("SHELL", "bash")).stem,
+        "term": os.environ.get("TERM", "xterm-256color"),
+    }
+
+
+def mk_env_context(
+    extra_context: dict[str, Any] | str | Path | None = None, console: Console | None = None, stable: bool = False
+) -> str:
     """
     Create environment context with optional extra context.
 
@@ -191,6 +243,9 @@ def mk_env_context(extra_context: dict[str, Any] | str | Path | None = None, con
             Dictionary will append / overwrite existing context
             String will be appended as-is
         console: Optional console to use
+        stable: Only include values that do not change between runs on the same day,
+            the date replaces the date and time and terminal dimensions are omitted.
+            Used when LLM responses are cached as the context is part of the cache key.
 
     Returns:
         str: The environment context as Markdown string
@@ -207,10 +262,13 @@ def mk_env_context(extra_context: dict[str, Any] | str | Path | None = None, con
     if isinstance(extra_context, Path):
         if not extra_context.is_file():
             raise ValueError(f"Extra context file not found or is not a file: {extra_context}")
+        import orjson
+
+        raw_context = extra_context.read_bytes()
         try:
-            extra_context = json.loads(extra_context.read_text(encoding="utf-8"))
+            extra_context = orjson.loads(raw_context)
         except Exception as _:
-            extra_context = extra_context.read_text(encoding="utf-8").strip()
+            extra_context = raw_context.decode("utf-8").strip()
 
     if isinstance(extra_context, dict):
         for k, v in extra_context.items():
@@ -224,25 +282,21 @@ def mk_env_context(extra_context: dict[str, Any] | str | Path | None = None, con
     if not console:
         console = Console(stderr=True)
 
+    dynamic_context: dict[str, str] = {"current_directory": Path(os.getcwd()).expanduser().as_posix()}
+    if stable:
+        dynamic_context["current_date"] = datetime.now(UTC).strftime("%Y-%m-%d")
+    else:
+        width, height = console.size
+        dynamic_context["current_date_and_time"] = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
+        dynamic_context["terminal_dimensions"] = f"{width}x{height}"
+
     return (
         (
             "<extra_context>\n"
             + "\n".join(
                 [
                     f"<{k}>{v}</{k}>"
-                    for k, v in (
-                        {
-                            "username": getpass.getuser(),
-                            "home_directory": Path("~").expanduser().as_posix(),
-                            "current_directory": Path(os.getcwd()).expanduser().as_posix(),
-                            "current_date_and_time": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC"),
-                            "platform": platform.platform(aliased=True, terse=True),
-                            "shell": Path(os.environ.get("SHELL", "bash")).stem,
-                            "term": os.environ.get("TERM", "xterm-256color"),
-                            "terminal_dimensions": f"{console.width}x{console.height}",
-                        }
-                        | extra_context
-                    ).items()  # type: ignore
+                    for k, v in (_static_env_context() | dynamic_context | extra_context).items()  # type: ignore
                 ]
             )
             + "\n"
@@ -292,6 +346,8 @@ def figlet_vertical(
         Calling this tool will send its output directly to the terminal. You do not need to capture the output.
     """
 
+    import pyfiglet
+
     if not console:
         console = console_err
 
@@ -351,6 +407,8 @@ def figlet_horizontal(
         Calling this tool will send its output directly to the terminal. You do not need to capture the output.
     """
 
+    import pyfiglet
+
     if not console:
         console = console_err
 
@@ -361,12 +419,13 @@ def figlet_horizontal(
     space_char_indexes: list[int] = []
     # used to not change colors for space characters
 
+    # figlet wraps at 80 chars by default override with actual console width, queried once for all letters
+    console_width = console.width
     # loop over each letter and generate figlet letter
     for i, letter in enumerate(text):
         if letter == " ":
             space_char_indexes.append(i)
-        figlet_chars.append(pyfiglet.figlet_format(letter, font=font, width=console.width))
-        # figlet wraps at 80 chars by default override with actual console width
+        figlet_chars.append(pyfiglet.figlet_format(letter, font=font, width=console_width))
 
         # break char into lines to get max height for padding
         char_lines = figlet_chars[i].split("\n")